@@ -1,179 +1,260 @@
-from datetime import datetime
-
-from utils.data_processor import (
-    region_wise_sales,
-    top_selling_products,
-    customer_analysis,
-    daily_sales_trend,
-    low_performing_products
-)
-
-
-
-def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt'):
-    """
-    Generates a comprehensive formatted text report
-    """
-    
-    with open(output_file, 'w', encoding='utf-8') as f:
-        # HEADER SECTION
-        f.write("=" * 44 + "\n")
-        f.write("          SALES ANALYTICS REPORT\n")
-        f.write(f"    Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
-        f.write(f"    Records Processed: {len(transactions)}\n")
-        f.write("=" * 44 + "\n\n")
-
-
-
-        # OVERALL SUMMARY
-        total_revenue = sum(t['Quantity'] * t['UnitPrice'] for t in transactions)
-        total_transactions = len(transactions)
-        avg_order_value = total_revenue / total_transactions if total_transactions else 0
-
-        dates = [t['Date'] for t in transactions]
-        start_date = min(dates)
-        end_date = max(dates)
-
-        f.write("OVERALL SUMMARY\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"Total Revenue:        ₹{total_revenue:,.2f}\n")
-        f.write(f"Total Transactions:   {total_transactions}\n")
-        f.write(f"Average Order Value:  ₹{avg_order_value:,.2f}\n")
-        f.write(f"Date Range:           {start_date} to {end_date}\n\n")
-
-
-        # REGION-WISE PERFORMANCE
-        region_data = region_wise_sales(transactions)
-
-        f.write("REGION-WISE PERFORMANCE\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"{'Region':<10}{'Sales':<15}{'% of Total':<12}{'Transactions'}\n")
-
-        for region, info in region_data.items():
-            f.write(
-                f"{region:<10}"
-                f"₹{info['total_sales']:,.2f}  "
-                f"{info['percentage']:<12}%"
-                f"{info['transaction_count']}\n"
-            )
-
-        f.write("\n")
-
-
-        # TOP 5 PRODUCTS
-        top_products = top_selling_products(transactions, n=5)
-
-        f.write("TOP 5 PRODUCTS\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"{'Rank':<6}{'Product Name':<25}{'Qty Sold':<10}{'Revenue'}\n")
-
-        for idx, product in enumerate(top_products, start=1):
-            name, qty, revenue = product
-            f.write(
-                f"{idx:<6}"
-                f"{name:<25}"
-                f"{qty:<10}"
-                f"₹{revenue:,.2f}\n"
-            )
-
-        f.write("\n")
-
-        # TOP 5 CUSTOMERS
-        customer_stats = customer_analysis(transactions)
-
-        f.write("TOP 5 CUSTOMERS\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"{'Rank':<6}{'Customer ID':<15}{'Total Spent':<15}{'Orders'}\n")
-
-        for idx, (cust_id, info) in enumerate(customer_stats.items(), start=1):
-            if idx > 5:
-                break
-
-            f.write(
-                f"{idx:<6}"
-                f"{cust_id:<15}"
-                f"₹{info['total_spent']:,.2f}  "
-                f"{info['purchase_count']}\n"
-            )
-
-        f.write("\n")
-
-
-        # DAILY SALES TREND
-        daily_stats = daily_sales_trend(transactions)
-
-        f.write("DAILY SALES TREND\n")
-        f.write("-" * 44 + "\n")
-        f.write(f"{'Date':<12}{'Revenue':<15}{'Transactions':<15}{'Unique Customers'}\n")
-
-        for date, stats in daily_stats.items():
-            f.write(
-                f"{date:<12}"
-                f"₹{stats['revenue']:,.2f}  "
-                f"{stats['transaction_count']:<15}"
-                f"{stats['unique_customers']}\n"
-            )
-
-        f.write("\n")
-
-
-
-        # PRODUCT PERFORMANCE ANALYSIS
-        f.write("PRODUCT PERFORMANCE ANALYSIS\n")
-        f.write("-" * 44 + "\n")
-
-        # Best Selling Day
-        best_day, best_data = max(
-            daily_stats.items(),
-            key=lambda x: x[1]['revenue']
-        )
-        f.write(
-            f"Best Selling Day: {best_day} "
-            f"(₹{best_data['revenue']:,.2f})\n"
-        )
-
-        # Low Performing Products
-        low_products = low_performing_products(transactions)
-        if low_products:
-            f.write("\nLow Performing Products:\n")
-            for product, qty, revenue in low_products:
-                f.write(
-                    f"- {product}: Qty={qty}, "
-                    f"Revenue=₹{revenue:,.2f}\n"
-                )
-        else:
-            f.write("\nLow Performing Products: None\n")
-
-        # Average Transaction Value per Region
-        f.write("\nAverage Transaction Value per Region:\n")
-        for region, stats in region_data.items():
-            avg_value = stats['total_sales'] / stats['transaction_count']
-            f.write(f"{region}: ₹{avg_value:,.2f}\n")
-
-        
-        # =====================================================
-        # 8. API ENRICHMENT SUMMARY
-        # =====================================================
-        
-        f.write("\n\nAPI ENRICHMENT SUMMARY\n")
-        f.write("-" * 44 + "\n")
-
-        total_records = len(enriched_transactions)
-        enriched_success = [t for t in enriched_transactions if t['API_Match']]
-        enriched_failed = [t for t in enriched_transactions if not t['API_Match']]
-
-        success_rate = (len(enriched_success) / total_records * 100) if total_records else 0
-
-        f.write(f"Total Products Enriched: {len(enriched_success)}\n")
-        f.write(f"Success Rate: {success_rate:.2f}%\n")
-
-        failed_products = sorted(set(t['ProductName'] for t in enriched_failed))
-        if failed_products:
-            f.write("Products Not Enriched:\n")
-            for product in failed_products:
-                f.write(f"- {product}\n")
-        else:
-            f.write("Products Not Enriched: None\n")
-
-
-
+from datetime import datetime
+from itertools import islice
+
+from utils.data_processor import (
+    region_wise_sales,
+    top_selling_products,
+    customer_analysis,
+    daily_sales_trend,
+    low_performing_products,
+    transactions_to_columns
+)
+
+# Section rules are constants; build them once at import
+_EQ_LINE = "=" * 44 + "\n"
+_DASH_LINE = "-" * 44 + "\n"
+
+# Row formatters bound at import: the column widths are fixed, so each
+# row becomes one call on a pre-parsed template instead of an f-string
+# re-dispatching every format spec
+_REGION_ROW = "{:<10}₹{:,.2f}  {:<12}%{}\n".format
+_PRODUCT_ROW = "{:<6}{:<25}{:<10}₹{:,.2f}\n".format
+_CUSTOMER_ROW = "{:<6}{:<15}₹{:,.2f}  {}\n".format
+_DAILY_ROW = "{:<12}₹{:,.2f}  {:<15}{}\n".format
+
+
+
+def _build_report_text(transactions, enriched_transactions):
+    """
+    Builds the complete report as a single string
+
+    Pure assembly: no file handle is held while the sections are
+    computed and formatted.
+    """
+    # Bound once: every money cell calls this instead of re-dispatching
+    # the ₹{:,.2f} format spec through an f-string
+    money = "₹{:,.2f}".format
+
+    parts = []
+
+    # Lengths are fixed for the whole build; compute them once
+    n_tx = len(transactions)
+    n_enriched = len(enriched_transactions)
+
+    # HEADER SECTION (one string per section, not per line)
+    parts.append(
+        _EQ_LINE
+        + "          SALES ANALYTICS REPORT\n"
+        f"    Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
+        f"    Records Processed: {n_tx}\n"
+        + _EQ_LINE + "\n"
+    )
+
+
+
+    # OVERALL SUMMARY over columns: one transpose, then the sum and
+    # min/max reductions run entirely in C instead of a Python loop.
+    # The empty case is handled up front so min/max never see an empty
+    # sequence and the transpose isn't even attempted
+    if n_tx:
+        amounts, dates = transactions_to_columns(transactions, 'Amount', 'Date')
+        total_revenue = sum(amounts)
+        start_date = min(dates)
+        end_date = max(dates)
+        avg_order_value = total_revenue / n_tx
+    else:
+        total_revenue = 0.0
+        start_date = end_date = '-'
+        avg_order_value = 0.0
+
+    parts.append(
+        "OVERALL SUMMARY\n"
+        + _DASH_LINE +
+        f"Total Revenue:        {money(total_revenue)}\n"
+        f"Total Transactions:   {n_tx}\n"
+        f"Average Order Value:  {money(avg_order_value)}\n"
+        f"Date Range:           {start_date} to {end_date}\n\n"
+    )
+
+
+    # REGION-WISE PERFORMANCE
+    region_data = region_wise_sales(transactions)
+
+    parts.append(
+        "REGION-WISE PERFORMANCE\n"
+        + _DASH_LINE +
+        f"{'Region':<10}{'Sales':<15}{'% of Total':<12}{'Transactions'}\n"
+    )
+
+    # Build the table rows and remember each region's average
+    # transaction value for the later section in the same pass
+    region_rows = []
+    region_avgs = []
+
+    for region, info in region_data.items():
+        region_rows.append(
+            _REGION_ROW(
+                region, info['total_sales'],
+                info['percentage'], info['transaction_count']
+            )
+        )
+        region_avgs.append(
+            (region, info['total_sales'] / info['transaction_count'])
+        )
+
+    parts.extend(region_rows)
+
+    parts.append("\n")
+
+
+    # TOP 5 PRODUCTS
+    top_products = top_selling_products(transactions, n=5)
+
+    parts.append(
+        "TOP 5 PRODUCTS\n"
+        + _DASH_LINE +
+        f"{'Rank':<6}{'Product Name':<25}{'Qty Sold':<10}{'Revenue'}\n"
+    )
+
+    product_rows = [
+        _PRODUCT_ROW(idx, name, qty, revenue)
+        for idx, (name, qty, revenue) in enumerate(top_products, start=1)
+    ]
+    parts.extend(product_rows)
+
+    parts.append("\n")
+
+    # TOP 5 CUSTOMERS
+    customer_stats = customer_analysis(transactions)
+
+    parts.append(
+        "TOP 5 CUSTOMERS\n"
+        + _DASH_LINE +
+        f"{'Rank':<6}{'Customer ID':<15}{'Total Spent':<15}{'Orders'}\n"
+    )
+
+    # customer_analysis returns customers sorted by spend, so the
+    # top 5 are simply the first 5 items
+    customer_rows = [
+        _CUSTOMER_ROW(idx, cust_id, info['total_spent'], info['purchase_count'])
+        for idx, (cust_id, info) in enumerate(islice(customer_stats.items(), 5), start=1)
+    ]
+    parts.append(''.join(customer_rows))
+
+    parts.append("\n")
+
+
+    # DAILY SALES TREND
+    daily_stats = daily_sales_trend(transactions)
+
+    parts.append(
+        "DAILY SALES TREND\n"
+        + _DASH_LINE +
+        f"{'Date':<12}{'Revenue':<15}{'Transactions':<15}{'Unique Customers'}\n"
+    )
+
+    # Track the best-selling day while writing the trend rows so the
+    # later section doesn't need its own pass over daily_stats
+    best_day = None
+    best_revenue = -1.0
+    daily_rows = []
+
+    for date, stats in daily_stats.items():
+        revenue = stats['revenue']
+        if revenue > best_revenue:
+            best_revenue, best_day = revenue, date
+
+        daily_rows.append(
+            _DAILY_ROW(
+                date, revenue,
+                stats['transaction_count'], stats['unique_customers']
+            )
+        )
+
+    # The trend is the highest-cardinality table (one row per date), so
+    # collapse its rows into a single string with one C-level join
+    parts.append(''.join(daily_rows))
+    parts.append("\n")
+
+
+
+    # PRODUCT PERFORMANCE ANALYSIS
+    parts.append("PRODUCT PERFORMANCE ANALYSIS\n" + _DASH_LINE)
+
+    # Best Selling Day (tracked during the daily trend loop above)
+    parts.append(
+        f"Best Selling Day: {best_day} "
+        f"({money(best_revenue)})\n"
+    )
+
+    # Low Performing Products
+    low_products = low_performing_products(transactions)
+    if low_products:
+        parts.append("\nLow Performing Products:\n")
+        for product, qty, revenue in low_products:
+            parts.append(
+                f"- {product}: Qty={qty}, "
+                f"Revenue={money(revenue)}\n"
+            )
+    else:
+        parts.append("\nLow Performing Products: None\n")
+
+    # Average Transaction Value per Region (computed with the table)
+    parts.append("\nAverage Transaction Value per Region:\n")
+    for region, avg_value in region_avgs:
+        parts.append(f"{region}: {money(avg_value)}\n")
+
+        
+    # =====================================================
+    # 8. API ENRICHMENT SUMMARY
+    # =====================================================
+        
+    parts.append("\n\nAPI ENRICHMENT SUMMARY\n" + _DASH_LINE)
+
+    # One partition pass: only the success count and the failed
+    # product names are ever used, so neither sublist is materialized.
+    # A dict keeps the names unique in first-seen order, so no sort
+    # pass is needed afterwards.
+    success_count = 0
+    failed_names = {}
+
+    for t in enriched_transactions:
+        if t['API_Match']:
+            success_count += 1
+        else:
+            failed_names[t['ProductName']] = None
+
+    success_rate = (success_count / n_enriched * 100) if n_enriched else 0
+
+    parts.append(f"Total Products Enriched: {success_count}\n")
+    parts.append(f"Success Rate: {success_rate:.2f}%\n")
+
+    failed_products = list(failed_names)
+    if failed_products:
+        parts.append("Products Not Enriched:\n")
+        for product in failed_products:
+            parts.append(f"- {product}\n")
+    else:
+        parts.append("Products Not Enriched: None\n")
+
+    return ''.join(parts)
+
+
+def generate_sales_report(transactions, enriched_transactions, output_file='output/sales_report.txt'):
+    """
+    Generates a comprehensive formatted text report
+    """
+    # Empty window: write a stub header and skip every analysis helper
+    if not transactions:
+        report = (
+            _EQ_LINE
+            + "     SALES ANALYTICS REPORT - NO DATA\n"
+            + _EQ_LINE
+        )
+    else:
+        report = _build_report_text(transactions, enriched_transactions)
+
+    # Encode once and write raw bytes: the single write bypasses the
+    # TextIOWrapper codec machinery entirely
+    with open(output_file, 'wb') as f:
+        f.write(report.encode('utf-8'))